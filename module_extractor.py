@@ -1,6 +1,6 @@
 import argparse
 import json
-from typing import List
+from typing import List, Optional
 
 from src.pulse_extractor.crawler import crawl_urls
 from src.pulse_extractor.extractor import extract_page_content
@@ -9,9 +9,24 @@ from src.pulse_extractor.output import to_output_list
 from src.pulse_extractor.cache import configure_cache
 
 
-def run(urls: List[str], max_pages: int = 200, per_domain_limit: int = 150, delay: float = 0.3):
-    configure_cache()
-    pages = crawl_urls(urls, max_pages=max_pages, per_domain_limit=per_domain_limit, delay=delay)
+def run(
+    urls: List[str],
+    max_pages: int = 200,
+    per_domain_limit: int = 150,
+    delay: float = 0.3,
+    record_warc: Optional[str] = None,
+    replay_warc: Optional[str] = None,
+):
+    if not replay_warc:
+        configure_cache()
+    pages = crawl_urls(
+        urls,
+        max_pages=max_pages,
+        per_domain_limit=per_domain_limit,
+        delay=delay,
+        record_warc=record_warc,
+        replay_warc=replay_warc,
+    )
     contents = [extract_page_content(p.url, p.html, getattr(p, 'content_type', None)) for p in pages]
     modules = infer_structure(contents)
     return to_output_list(modules)
@@ -22,10 +37,20 @@ def main():
     parser.add_argument("--urls", nargs="+", required=True, help="One or more documentation URLs")
     parser.add_argument("--max-pages", type=int, default=0, help="Maximum pages across sources (0 for unlimited)")
     parser.add_argument("--per-domain-limit", type=int, default=0, help="Max pages per domain (0 for unlimited)")
-    parser.add_argument("--delay", type=float, default=0.3, help="Crawler throttle delay between requests (seconds)")
+    parser.add_argument("--delay", type=float, default=0.3, help="Starting per-host delay between requests (seconds); adapted to each host's responses")
+    warc = parser.add_mutually_exclusive_group()
+    warc.add_argument("--record-warc", metavar="PATH", help="Append fetched responses to a compressed WARC file (.warc.gz)")
+    warc.add_argument("--replay-warc", metavar="PATH", help="Crawl from a recorded WARC file instead of the network")
     args = parser.parse_args()
 
-    result = run(args.urls, max_pages=args.max_pages, per_domain_limit=args.per_domain_limit, delay=args.delay)
+    result = run(
+        args.urls,
+        max_pages=args.max_pages,
+        per_domain_limit=args.per_domain_limit,
+        delay=args.delay,
+        record_warc=args.record_warc,
+        replay_warc=args.replay_warc,
+    )
     print(json.dumps(result, indent=2, ensure_ascii=False))
 
 
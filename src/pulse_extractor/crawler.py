@@ -2,14 +2,15 @@ import re
 import time
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Set, Dict, Optional, Tuple
 
-import requests
-from bs4 import BeautifulSoup
-import tldextract
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit
 from urllib.robotparser import RobotFileParser
 
+from .scheduler import HostScheduler
+from .warc import WarcArchive, WarcRecorder
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("pulse.crawler")
 
@@ -35,11 +36,35 @@ def _normalize_url(u: str) -> Optional[str]:
         return None
 
 
-def _domain(url: str) -> str:
-    ext = tldextract.extract(url)
+_tld_extractor = None
+
+
+def _get_tld_extractor():
+    # Built on first use: importing tldextract is slow, and the default extractor may try to
+    # download the public suffix list. An empty suffix_list_urls pins it to the snapshot bundled
+    # with the package, so lookups never touch the network or the on-disk cache.
+    global _tld_extractor
+    if _tld_extractor is None:
+        import tldextract
+        _tld_extractor = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, fallback_to_snapshot=True)
+    return _tld_extractor
+
+
+@lru_cache(maxsize=4096)
+def _host_domain(host: str) -> str:
+    ext = _get_tld_extractor()(host)
     return ".".join([p for p in [ext.subdomain, ext.domain, ext.suffix] if p])
 
 
+def _domain(url: str) -> str:
+    # Memoise per host rather than per URL: a crawl visits many URLs on only a handful of hosts.
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        host = None
+    return _host_domain(host or url)
+
+
 def _robots_allowed(url: str) -> bool:
     try:
         parsed = urlparse(url)
@@ -77,33 +102,142 @@ def _is_relevant_link(href: str) -> bool:
     return href.startswith('/')
 
 
-def _fetch(url: str, timeout: int = 20, retries: int = 2) -> Optional[Tuple[str, Optional[str]]]:
+def _text_content(url: str, text: str, ctype: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+    # Only process textual content
+    if ctype and ("text/html" in ctype or "text/plain" in ctype or "text/markdown" in ctype):
+        return text, ctype
+    # Fallback: if content-type missing, try using text
+    if not ctype:
+        return text, None
+    # Non-text types skipped
+    logger.debug(f"Skipping non-text content-type: {ctype} for {url}")
+    return None
+
+
+# Returned by _fetch, when given a scheduler, for outcomes worth retrying (429, 5xx, network
+# errors). The crawl loop re-queues the URL and serves other ready hosts while this one cools down.
+RETRY_LATER = object()
+
+
+def _retryable(status: Optional[int]) -> bool:
+    return status is None or status == 429 or status >= 500
+
+
+def _fetch(
+    url: str,
+    timeout: int = 20,
+    retries: int = 2,
+    scheduler: Optional[HostScheduler] = None,
+    host: Optional[str] = None,
+    recorder: Optional[WarcRecorder] = None,
+):
+    # Returns (text, content_type), None, or RETRY_LATER. With a scheduler, a single attempt is
+    # made (the caller has already spent the host's token) and the outcome is fed back to it;
+    # retrying is left to the caller so that one cooling-down host never blocks the others.
+    # Without one, retries happen here with a fixed backoff.
+    import requests
+
     backoff = 0.6
-    for attempt in range(retries + 1):
+    attempts = 1 if scheduler is not None else retries + 1
+    for attempt in range(attempts):
+        start = time.monotonic()
+        status = None
         try:
             resp = requests.get(url, timeout=timeout, headers={"User-Agent": "PulseCrawler/1.0"})
-            ctype = resp.headers.get("Content-Type", "") if resp is not None else None
-            if resp.status_code == 200 and resp.text:
-                # Only process textual content
-                if ctype and ("text/html" in ctype or "text/plain" in ctype or "text/markdown" in ctype):
-                    return resp.text, ctype
-                # Fallback: if content-type missing, try using text
-                if not ctype:
-                    return resp.text, None
-                # Non-text types skipped
-                logger.debug(f"Skipping non-text content-type: {ctype} for {url}")
-                return None
-            else:
-                logger.debug(f"Non-200 status {resp.status_code if resp else 'N/A'} for {url}")
         except Exception as e:
+            resp = None
+            if scheduler is not None:
+                scheduler.record(host, None, time.monotonic() - start)
             logger.debug(f"Fetch error on attempt {attempt} for {url}: {e}")
+        if resp is not None:
+            status = resp.status_code
+            if scheduler is not None:
+                if getattr(resp, "from_cache", False):
+                    scheduler.refund(host)
+                else:
+                    scheduler.record(host, status, time.monotonic() - start, resp.headers.get("Retry-After"))
+            try:
+                ctype = resp.headers.get("Content-Type", "")
+                text = resp.text
+            except Exception as e:
+                # Undecodable body: skip this URL rather than abort the crawl.
+                logger.debug(f"Could not decode {url}: {e}")
+                return None
+            if recorder is not None:
+                _record(recorder, url, resp)
+            if resp.status_code == 200 and text:
+                return _text_content(url, text, ctype)
+            logger.debug(f"Non-200 status {resp.status_code} for {url}")
+        if scheduler is not None:
+            return RETRY_LATER if _retryable(status) else None
         if attempt < retries:
             time.sleep(backoff)
             backoff *= 1.5
     return None
 
 
-def crawl_urls(urls: List[str], max_pages: int = 200, per_domain_limit: int = 150, delay: float = 0.3) -> List[Page]:
+def _record(recorder: WarcRecorder, url: str, resp) -> None:
+    # A failing archive write (disk full, warcio error) loses the capture, not the crawl.
+    try:
+        # resp.text decodes with resp.encoding, falling back to the detected charset; store the one
+        # actually used so replay yields the same text.
+        encoding = resp.encoding or resp.apparent_encoding
+        recorder.write_response(url, resp.status_code, resp.reason, resp.headers, resp.content, encoding=encoding)
+    except Exception as e:
+        logger.warning(f"Could not record {url} to {recorder.path}: {e}")
+
+
+def _replay(url: str, archive: WarcArchive) -> Optional[Tuple[str, Optional[str]]]:
+    # Serve a page from a recorded WARC archive instead of the network.
+    try:
+        archived = archive.get(url)
+    except Exception as e:
+        logger.warning(f"Could not read {url} from {archive.path}: {e}")
+        return None
+    if archived is None:
+        logger.debug(f"Not in archive: {url}")
+        return None
+    ctype = next((v for k, v in archived.headers.items() if k.lower() == "content-type"), "")
+    if archived.status == 200 and archived.text:
+        return _text_content(url, archived.text, ctype)
+    logger.debug(f"Non-200 status {archived.status} for {url} (replayed)")
+    return None
+
+
+def crawl_urls(
+    urls: List[str],
+    max_pages: int = 200,
+    per_domain_limit: int = 150,
+    delay: float = 0.3,
+    record_warc: Optional[str] = None,
+    replay_warc: Optional[str] = None,
+) -> List[Page]:
+    # record_warc appends every fetched response to a WARC file; replay_warc serves pages from
+    # such a file with no network access (robots.txt and throttling are skipped, since they were
+    # honoured when the archive was recorded).
+    if record_warc and replay_warc:
+        raise ValueError("record_warc and replay_warc cannot be used together")
+    recorder = WarcRecorder(record_warc) if record_warc else None
+    archive = WarcArchive(replay_warc) if replay_warc else None
+    try:
+        return _crawl(urls, max_pages, per_domain_limit, delay, recorder, archive)
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if archive is not None:
+            archive.close()
+
+
+def _crawl(
+    urls: List[str],
+    max_pages: int,
+    per_domain_limit: int,
+    delay: float,
+    recorder: Optional[WarcRecorder],
+    archive: Optional[WarcArchive],
+) -> List[Page]:
+    from bs4 import BeautifulSoup
+
     # Normalize input URLs and organize them into per-domain queues to ensure fair crawling across domains.
     normalized = [u for u in (_normalize_url(u) for u in urls) if u]
     domain_queues: Dict[str, List[str]] = {}
@@ -137,71 +271,82 @@ def crawl_urls(urls: List[str], max_pages: int = 200, per_domain_limit: int = 15
         for d in domain_order:
             domain_budget[d] = float('inf')
 
-    def _has_work() -> bool:
-        for q in domain_queues.values():
-            if q:
-                return True
-        return False
-
-    # Round-robin across domains; first pass respects fair budgets, then fill remaining cap.
-    fair_phase = True
-    while _has_work() and (unlimited_pages or len(pages) < max_pages):
-        for dom in list(domain_order):
-            q = domain_queues.get(dom, [])
-            if not q:
-                continue
-
-            # Stop if we've reached the page cap
-            if not unlimited_pages and len(pages) >= max_pages:
-                break
-
-            # In fair phase, skip domains that reached their budget
-            if fair_phase and domain_used.get(dom, 0) >= domain_budget.get(dom, 0):
+    # Politeness is enforced per host: `delay` is each host's starting interval, adapted to how
+    # the host responds. Rather than sleeping after every page, pick the next host that is ready.
+    scheduler = HostScheduler(delay=0 if archive is not None else delay)
+    # Retries are re-queued rather than slept on; this counts the attempts made per URL.
+    attempts: Dict[str, int] = {}
+    max_retries = 2
+
+    def _prune(dom: str) -> None:
+        # Drop queued URLs that would not be fetched, so no host is waited on for nothing.
+        q = domain_queues[dom]
+        if not unlimited_domain and domain_counts.get(dom, 0) >= per_domain_limit:
+            q.clear()
+        while q and q[0] in visited:
+            q.pop(0)
+
+    def _eligible(fair: bool) -> List[str]:
+        for d in domain_order:
+            _prune(d)
+        # In fair phase, skip domains that reached their budget
+        return [
+            d for d in domain_order
+            if domain_queues[d] and not (fair and domain_used.get(d, 0) >= domain_budget.get(d, 0))
+        ]
+
+    # First phase respects fair budgets, then fill remaining cap.
+    fair_phase = not unlimited_pages
+    while unlimited_pages or len(pages) < max_pages:
+        candidates = _eligible(fair_phase)
+        if not candidates:
+            # Switch out of fair phase when all budgets are satisfied or no work remains for budgeted domains
+            if fair_phase:
+                fair_phase = False
                 continue
-
-            url = q.pop(0)
-            if url in visited:
+            break
+
+        dom = scheduler.next_host(candidates)
+        url = domain_queues[dom].pop(0)
+        visited.add(url)
+
+        count = domain_counts.get(dom, 0)
+        if archive is not None:
+            # Never sleeps (delay 0), but keeps the same round-robin order as the recorded crawl.
+            scheduler.acquire(dom)
+            fetched = _replay(url, archive)
+        else:
+            if url not in attempts and not _robots_allowed(url):
                 continue
-            visited.add(url)
-
-            count = domain_counts.get(dom, 0)
-            if not unlimited_domain and count >= per_domain_limit:
+            scheduler.acquire(dom)
+            fetched = _fetch(url, scheduler=scheduler, host=dom, recorder=recorder)
+            if fetched is RETRY_LATER:
+                attempts[url] = attempts.get(url, 0) + 1
+                if attempts[url] <= max_retries:
+                    # Back at the head of its host's queue: it goes out once the host is ready
+                    # again, while next_host serves the other hosts in the meantime.
+                    visited.discard(url)
+                    domain_queues[dom].insert(0, url)
                 continue
-            if not _robots_allowed(url):
+        if not fetched:
+            continue
+        html, content_type = fetched
+        pages.append(Page(url=url, html=html, content_type=content_type))
+        domain_counts[dom] = count + 1
+        domain_used[dom] = domain_used.get(dom, 0) + 1
+        logger.info(f"Fetched {url}")
+
+        soup = BeautifulSoup(html, 'lxml')
+        for a in soup.find_all('a', href=True):
+            href = a.get('href')
+            if not _is_relevant_link(href):
                 continue
-
-            fetched = _fetch(url)
-            if not fetched:
+            new_url = urljoin(url, href)
+            new_dom = _domain(new_url)
+            if new_dom != dom:
+                # restrict to same domain
                 continue
-            html, content_type = fetched
-            pages.append(Page(url=url, html=html, content_type=content_type))
-            domain_counts[dom] = count + 1
-            domain_used[dom] = domain_used.get(dom, 0) + 1
-            logger.info(f"Fetched {url}")
-
-            soup = BeautifulSoup(html, 'lxml')
-            for a in soup.find_all('a', href=True):
-                href = a.get('href')
-                if not _is_relevant_link(href):
-                    continue
-                new_url = urljoin(url, href)
-                new_dom = _domain(new_url)
-                if new_dom != dom:
-                    # restrict to same domain
-                    continue
-                if new_url not in visited:
-                    domain_queues[new_dom].append(new_url)
-
-            time.sleep(delay)
-
-        # Switch out of fair phase when all budgets are satisfied or no work remains for budgeted domains
-        if fair_phase and not unlimited_pages:
-            all_satisfied = True
-            for d in domain_order:
-                if domain_used.get(d, 0) < domain_budget.get(d, 0) and domain_queues.get(d):
-                    all_satisfied = False
-                    break
-            if all_satisfied:
-                fair_phase = False
+            if new_url not in visited:
+                domain_queues[new_dom].append(new_url)
 
     return pages
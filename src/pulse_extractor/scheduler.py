@@ -0,0 +1,167 @@
+import time
+import logging
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger("pulse.scheduler")
+
+
+@dataclass
+class HostState:
+    # Token bucket: one token is spent per request and tokens refill every `interval` seconds.
+    interval: float
+    tokens: float = 1.0
+    updated: float = 0.0
+    blocked_until: float = 0.0
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    # Sequence number of the host's latest request (0 = never served); used for round-robin ties.
+    last_served: int = 0
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    # Retry-After is either delta-seconds or an HTTP date; returns seconds to wait.
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    wall = time.time() if now is None else now
+    return max(0.0, when.timestamp() - wall)
+
+
+class HostScheduler:
+    # Per-host adaptive rate limiting. Each host starts at one request per `delay` seconds and
+    # is slowed down on 429/Retry-After, 5xx responses or rising latency, and sped up again while
+    # it answers quickly and cleanly. Callers ask for the next ready host instead of sleeping
+    # globally, so adding domains adds throughput while each site still sees polite traffic.
+
+    def __init__(
+        self,
+        delay: float = 0.3,
+        burst: int = 1,
+        min_delay: Optional[float] = None,
+        max_delay: float = 30.0,
+        max_retry_after: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        # clock/sleep are injectable so the scheduler can be driven with fake timings.
+        self.clock = clock
+        self.sleep = sleep
+        self.delay = max(0.0, delay or 0.0)
+        self.burst = max(1, int(burst))
+        self.min_delay = self.delay / 4 if min_delay is None else max(0.0, min_delay)
+        self.max_delay = max(self.delay, max_delay)
+        self.max_retry_after = max_retry_after
+        # Backing off from a zero delay still has to slow the host down.
+        self.backoff_floor = max(self.delay, 0.5)
+        self.hosts: Dict[str, HostState] = {}
+        # A counter rather than a timestamp: coarse clocks (e.g. ~15ms on Windows) would tie.
+        self._served = 0
+
+    def _state(self, host: str) -> HostState:
+        st = self.hosts.get(host)
+        if st is None:
+            st = HostState(interval=self.delay, tokens=float(self.burst), updated=self.clock())
+            self.hosts[host] = st
+        return st
+
+    def _refill(self, st: HostState, now: float) -> None:
+        if st.interval <= 0:
+            st.tokens = float(self.burst)
+        else:
+            st.tokens = min(float(self.burst), st.tokens + (now - st.updated) / st.interval)
+        st.updated = now
+
+    def ready_in(self, host: str, now: Optional[float] = None) -> float:
+        # Seconds until `host` may be requested again (0 when a token is available).
+        now = self.clock() if now is None else now
+        st = self._state(host)
+        self._refill(st, now)
+        wait = 0.0 if st.tokens >= 1.0 else (1.0 - st.tokens) * st.interval
+        return max(wait, st.blocked_until - now, 0.0)
+
+    def next_host(self, hosts: Iterable[str]) -> Optional[str]:
+        # Pick the host that is ready soonest, least recently served first; sleep only when no
+        # candidate is ready yet, and then only until the earliest one is.
+        candidates = list(hosts)
+        if not candidates:
+            return None
+        now = self.clock()
+        best = min(candidates, key=lambda h: (self.ready_in(h, now), self._state(h).last_served))
+        wait = self.ready_in(best, now)
+        if wait > 0:
+            self.sleep(wait)
+        return best
+
+    def acquire(self, host: str) -> None:
+        # Block until `host` has a token, then spend it.
+        wait = self.ready_in(host)
+        if wait > 0:
+            self.sleep(wait)
+        now = self.clock()
+        st = self._state(host)
+        self._refill(st, now)
+        st.tokens = max(0.0, st.tokens - 1.0)
+        self._served += 1
+        st.last_served = self._served
+
+    def refund(self, host: str) -> None:
+        # Give the token back when the request never reached the host (e.g. served from cache).
+        st = self._state(host)
+        st.tokens = min(float(self.burst), st.tokens + 1.0)
+
+    def _slow_down(self, st: HostState, factor: float) -> None:
+        st.interval = min(self.max_delay, max(st.interval * factor, self.backoff_floor))
+
+    def _speed_up(self, st: HostState) -> None:
+        st.interval = max(self.min_delay, st.interval * 0.9)
+
+    def record(
+        self,
+        host: str,
+        status: Optional[int],
+        latency: Optional[float] = None,
+        retry_after: Optional[str] = None,
+    ) -> None:
+        # Feed back the outcome of a request. `status` is None for network errors/timeouts.
+        # Retry-After is only honoured on 429/503, where it asks the client to back off.
+        now = self.clock()
+        st = self._state(host)
+        failed = status is None or status >= 500 or status == 429
+        st.error_rate = 0.8 * st.error_rate + (0.2 if failed else 0.0)
+
+        if status in (429, 503):
+            wait = parse_retry_after(retry_after)
+            if wait is None:
+                wait = max(self.backoff_floor, st.interval * 2)
+            wait = min(wait, self.max_retry_after)
+            st.blocked_until = max(st.blocked_until, now + wait)
+            self._slow_down(st, 2.0)
+            logger.info(f"Backing off {host} for {wait:.1f}s (status {status})")
+            return
+
+        if failed:
+            # Back off harder as the recent 5xx/timeout rate climbs.
+            self._slow_down(st, 1.5 + st.error_rate)
+            return
+
+        if latency is None:
+            return
+        previous = st.latency
+        st.latency = latency if previous is None else 0.7 * previous + 0.3 * latency
+        if previous is not None and latency > 2 * previous:
+            self._slow_down(st, 1.25)
+        elif st.error_rate < 0.05 and (previous is None or latency <= 1.1 * previous):
+            # Steady or falling latency on a healthy host (with slack for jitter).
+            self._speed_up(st)
@@ -0,0 +1,286 @@
+from typing import Any, Dict, List, Optional
+
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+
+# Non-content areas removed before segmentation (matched per class token, by substring).
+NOISE_ROLES = {'navigation', 'banner', 'contentinfo'}
+NOISE_CLASSES = ['nav', 'navbar', 'menu', 'footer', 'header', 'breadcrumbs', 'sub-nav', 'sidebar', 'site-header', 'site-footer']
+
+# Bounds on what segmentation accumulates for pathological pages (the parsed tree itself still
+# grows with the page). Inference only ever summarises the first few hundred characters of a
+# section, so long bodies are truncated rather than accumulated.
+MAX_SECTION_CHARS = 4000
+MAX_TITLE_CHARS = 300
+MAX_SECTIONS = 20000
+MAX_FALLBACK_PARAGRAPHS = 6
+
+# Main content containers (improves help centers like Zendesk/WordPress), in priority order.
+# The first instance of each kind in the document is tracked; the highest-priority one wins.
+_MAIN_KINDS = 4
+
+
+def _classes(el) -> List[str]:
+    return (el.get('class') or '').split()
+
+
+def _main_kind(tag: str, el) -> Optional[int]:
+    if tag == 'main':
+        return 0
+    if tag == 'article':
+        return 1
+    if tag == 'div':
+        if any('article-body' in c or 'post-content' in c or 'content' in c for c in _classes(el)):
+            return 2
+    elif tag == 'section':
+        if any('content' in c or 'article' in c for c in _classes(el)):
+            return 3
+    return None
+
+
+def parse_html(html: str):
+    # Parse once with lxml; returns None for documents lxml considers empty.
+    import lxml.html
+    from lxml import etree
+
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except etree.ParserError:
+        return None
+    except ValueError:
+        pass
+    # Unicode strings with an XML encoding declaration must be handed over as bytes.
+    try:
+        return lxml.html.document_fromstring(html.encode('utf-8'))
+    except etree.ParserError:
+        return None
+
+
+def clean_tree(root) -> None:
+    # Remove common non-content areas by role/class hints, in a single pass over the tree.
+    from lxml import etree
+
+    noise = []
+    for el in root.iter(etree.Element):
+        # Never drop the document itself (e.g. Bulma's <html class="has-navbar-fixed-top">).
+        if el.getparent() is None or el.tag == 'body':
+            continue
+        if el.get('role') in NOISE_ROLES:
+            noise.append(el)
+            continue
+        for c in _classes(el):
+            if any(cls in c for cls in NOISE_CLASSES):
+                noise.append(el)
+                break
+    for el in noise:
+        # drop_tree keeps the element's tail text, which belongs to the parent.
+        el.drop_tree()
+
+
+def _strip_comments(root) -> None:
+    # iterwalk only reports elements, so the tail text of comments and processing instructions
+    # would be lost (server-rendered pages put <!-- --> between text nodes). Remove them up front,
+    # merging their tails into the preceding text as lxml.html's drop_tree does.
+    from lxml import etree
+
+    for node in list(root.iter(etree.Comment, etree.ProcessingInstruction)):
+        parent = node.getparent()
+        if parent is None:
+            continue
+        if node.tail:
+            prev = node.getprevious()
+            if prev is not None:
+                prev.tail = (prev.tail or '') + node.tail
+            else:
+                parent.text = (parent.text or '') + node.tail
+        parent.remove(node)
+
+
+class _Segment:
+    __slots__ = ('title', 'level', 'depth', 'mask', 'lines', 'line', 'chars')
+
+    def __init__(self, title: str, level: int, depth: int, mask: int):
+        self.title = title
+        self.level = level
+        self.depth = depth
+        self.mask = mask
+        self.lines: List[str] = []
+        self.line: List[str] = []
+        self.chars = 0
+
+    def add(self, text: str) -> None:
+        if self.chars < MAX_SECTION_CHARS:
+            self.line.append(text)
+            self.chars += len(text) + 1
+
+    def flush(self) -> None:
+        if self.line:
+            self.lines.append(" ".join(self.line))
+            self.line = []
+
+    def body(self) -> str:
+        self.flush()
+        return "\n".join(self.lines)[:MAX_SECTION_CHARS]
+
+
+def segment(root) -> Dict[str, Any]:
+    """Split a parsed document into heading/body sections in one in-order walk.
+
+    A heading's body is the text of its following siblings up to the next sibling heading or
+    the end of its parent, so headings nested deeper (e.g. inside a sibling ``div``) also
+    contribute to the enclosing section, and each section keeps one line per sibling. Cost is
+    linear in the size of the document: open sections form a stack ordered by depth (at most one
+    per depth), so closing and flushing only touch its top, and text is only handed to sections
+    that are still below ``MAX_SECTION_CHARS``.
+    Comments and processing instructions are removed from ``root`` in place.
+    """
+    from lxml import etree
+
+    _strip_comments(root)
+
+    headings: List[Dict[str, Any]] = []
+    segments: List[_Segment] = []
+    # Open sections, strictly increasing in depth; `accepting` is the subset (same order) that
+    # still takes text.
+    open_segs: List[_Segment] = []
+    accepting: List[_Segment] = []
+
+    main_found = [False] * _MAIN_KINDS
+    main_open: Dict[Any, int] = {}
+    mask = 0
+    paragraphs: List[List[str]] = [[] for _ in range(_MAIN_KINDS + 1)]
+
+    depth = 0
+    skip_depth = 0
+    heading_el = None
+    heading_depth = 0
+    heading_mask = 0
+    heading_buf: List[str] = []
+    para_el = None
+    para_buf: List[str] = []
+    page_title = None
+    title_el = None
+    title_buf: List[str] = []
+
+    def _text(raw: Optional[str]) -> None:
+        if not raw or skip_depth:
+            return
+        if heading_el is not None and sum(len(t) for t in heading_buf) < MAX_TITLE_CHARS:
+            heading_buf.append(raw)
+        if title_el is not None:
+            title_buf.append(raw)
+        stripped = raw.strip()
+        if not stripped:
+            return
+        if para_el is not None:
+            para_buf.append(stripped)
+        full = False
+        for seg in accepting:
+            seg.add(stripped)
+            full = full or seg.chars >= MAX_SECTION_CHARS
+        if full:
+            accepting[:] = [seg for seg in accepting if seg.chars < MAX_SECTION_CHARS]
+
+    def _close_deeper_than(d: int) -> None:
+        while open_segs and open_segs[-1].depth > d:
+            seg = open_segs.pop()
+            seg.flush()
+            if accepting and accepting[-1] is seg:
+                accepting.pop()
+
+    def _flush_at(d: int) -> None:
+        # Only the top of the stack can sit at depth `d` once deeper sections are closed.
+        if open_segs and open_segs[-1].depth == d:
+            open_segs[-1].flush()
+
+    for event, el in etree.iterwalk(root, events=('start', 'end')):
+        tag = el.tag
+        if event == 'start':
+            depth += 1
+            if tag in SKIP_TAGS:
+                skip_depth += 1
+                continue
+            if skip_depth:
+                continue
+            kind = _main_kind(tag, el)
+            if kind is not None and not main_found[kind]:
+                main_found[kind] = True
+                main_open[el] = kind
+                mask |= 1 << kind
+            if tag in HEADING_TAGS and heading_el is None:
+                # A sibling heading ends the previous section at this level.
+                _close_deeper_than(depth - 1)
+                heading_el = el
+                heading_depth = depth
+                heading_mask = mask
+                heading_buf = []
+            elif tag == 'p' and para_el is None:
+                para_el = el
+                para_buf = []
+            elif tag == 'title' and page_title is None and title_el is None:
+                title_el = el
+                title_buf = []
+            _text(el.text)
+            continue
+
+        # end event
+        if tag in SKIP_TAGS:
+            skip_depth -= 1
+        elif skip_depth:
+            pass
+        elif el is heading_el:
+            title = "".join(heading_buf).strip()[:MAX_TITLE_CHARS]
+            level = int(tag[1])
+            heading_el = None
+            if title:
+                if level <= 5 and len(headings) < MAX_SECTIONS:
+                    headings.append({'level': level, 'title': title})
+                if len(segments) < MAX_SECTIONS:
+                    seg = _Segment(title, level, heading_depth, heading_mask)
+                    segments.append(seg)
+                    open_segs.append(seg)
+                    accepting.append(seg)
+        elif el is para_el:
+            para_el = None
+            text = " ".join(para_buf)
+            if text:
+                for kind in range(_MAIN_KINDS):
+                    if mask & (1 << kind) and len(paragraphs[kind]) < MAX_FALLBACK_PARAGRAPHS:
+                        paragraphs[kind].append(text)
+                if len(paragraphs[_MAIN_KINDS]) < MAX_FALLBACK_PARAGRAPHS:
+                    paragraphs[_MAIN_KINDS].append(text)
+        elif el is title_el:
+            title_el = None
+            page_title = "".join(title_buf).strip()
+
+        if el in main_open:
+            mask &= ~(1 << main_open.pop(el))
+
+        # Sections whose heading was a child of this element end with it.
+        _close_deeper_than(depth)
+        # Each sibling of a heading, and each run of text between siblings, is one body line.
+        _flush_at(depth)
+        depth -= 1
+        _text(el.tail)
+        _flush_at(depth + 1)
+
+    main_kind = next((k for k in range(_MAIN_KINDS) if main_found[k]), None)
+    sections = []
+    for seg in segments:
+        if main_kind is not None and not seg.mask & (1 << main_kind):
+            continue
+        body = seg.body()
+        if body:
+            sections.append({'title': seg.title, 'body': body, 'level': seg.level})
+
+    # Headings are reported by level, then document order.
+    headings.sort(key=lambda h: h['level'])
+
+    return {
+        'headings': headings,
+        'sections': sections,
+        'paragraphs': paragraphs[_MAIN_KINDS if main_kind is None else main_kind],
+        'title': page_title,
+    }
@@ -0,0 +1,136 @@
+import io
+import logging
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger("pulse.warc")
+
+# Extension WARC header holding the charset the crawler decoded the body with.
+ENCODING_HEADER = "WARC-Pulse-Encoding"
+
+# Headers describing the wire encoding of the original body. The stored payload is already
+# decoded, so these are dropped and Content-Length is rewritten to match what is on disk.
+_WIRE_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+
+@dataclass
+class ArchivedResponse:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    text: str
+
+
+class WarcRecorder:
+    # Appends fetched responses to a gzip-compressed WARC file (one gzip member per record),
+    # so a crawl captured once can be replayed offline with WarcArchive.
+
+    def __init__(self, path: str):
+        from warcio.warcwriter import WARCWriter
+
+        self.path = path
+        self._fh = open(path, "ab")
+        self._writer = WARCWriter(self._fh, gzip=True)
+
+    def write_response(
+        self,
+        url: str,
+        status: int,
+        reason: Optional[str],
+        headers: Mapping[str, str],
+        body: bytes,
+        encoding: Optional[str] = None,
+    ) -> None:
+        from warcio.statusandheaders import StatusAndHeaders
+
+        header_list = [(k, v) for k, v in headers.items() if k.lower() not in _WIRE_HEADERS]
+        header_list.append(("Content-Length", str(len(body))))
+        http_headers = StatusAndHeaders(f"{status} {reason or ''}".strip(), header_list, protocol="HTTP/1.1")
+        warc_headers = {ENCODING_HEADER: encoding} if encoding else None
+        record = self._writer.create_warc_record(
+            url, "response", payload=io.BytesIO(body), warc_headers_dict=warc_headers, http_headers=http_headers
+        )
+        self._writer.write_record(record)
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class WarcArchive:
+    # Read-only view of a WARC file for replay. The archive is indexed once (target URI -> record
+    # offset); lookups then seek straight to the record. When a URL was captured more than once,
+    # the latest capture wins.
+
+    def __init__(self, path: str):
+        from warcio.archiveiterator import ArchiveIterator
+
+        self.path = path
+        self._fh = open(path, "rb")
+        self._index: Dict[str, int] = {}
+        it = ArchiveIterator(self._fh)
+        for record in it:
+            if record.rec_type != "response":
+                continue
+            uri = record.rec_headers.get_header("WARC-Target-URI")
+            if uri:
+                self._index[uri] = it.get_record_offset()
+        logger.info(f"Indexed {len(self._index)} responses from {path}")
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, url: str) -> Optional[ArchivedResponse]:
+        from warcio.archiveiterator import ArchiveIterator
+
+        offset = self._index.get(url)
+        if offset is None:
+            return None
+        self._fh.seek(offset)
+        record = next(iter(ArchiveIterator(self._fh)))
+        status, headers = _status_and_headers(record)
+        body = record.content_stream().read()
+        encoding = record.rec_headers.get_header(ENCODING_HEADER)
+        return ArchivedResponse(url=url, status=status, headers=headers, text=_decode(body, headers, encoding))
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _status_and_headers(record) -> Tuple[int, Dict[str, str]]:
+    http_headers = record.http_headers
+    try:
+        status = int(http_headers.get_statuscode())
+    except (TypeError, ValueError):
+        status = 0
+    return status, {k: v for k, v in http_headers.headers}
+
+
+def _decode(body: bytes, headers: Mapping[str, str], encoding: Optional[str] = None) -> str:
+    # Prefer the charset recorded at crawl time. Archives written without it fall back to requests'
+    # header-based rule; only its content sniffing (used when there is no charset at all) is
+    # approximated with UTF-8.
+    if not encoding:
+        from requests.utils import get_encoding_from_headers
+
+        lowered = {k.lower(): v for k, v in headers.items()}
+        encoding = get_encoding_from_headers({"content-type": lowered.get("content-type", "")}) or "utf-8"
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
@@ -0,0 +1,88 @@
+# Segmentation benchmark on synthetic API-reference style pages.
+# Quick-run:
+# python tests/bench_segmenter.py --sections 1000 4000 --nesting 1 100 240 --runs 3
+#
+# Times parse + clean + segment (trafilatura excluded) so that regressions in the single-pass
+# segmenter stay visible; cost should grow linearly with page size and stay flat as headings
+# nest deeper (the "nested" rows keep the page size roughly constant).
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.pulse_extractor.segmenter import parse_html, clean_tree, segment
+
+
+def _page(n: int) -> str:
+    # Each block: a module heading with prose, then a nested submodule with a code sample.
+    block = (
+        "<h2>Section {i}</h2><p>" + "lorem ipsum <!-- -->dolor " * 30 + "</p>"
+        "<div class='endpoint'><h3>Sub {i}</h3><p>body {i}</p><pre>" + "code " * 100 + "</pre></div>"
+    )
+    return "<html><body><nav class='sidebar'><a href='/x'>x</a></nav><main>" + "".join(
+        block.format(i=i) for i in range(n)
+    ) + "</main></body></html>"
+
+
+def _nested_page(levels: int, words: int = 60000) -> str:
+    # One large run of inline text under `levels` nested <div><h2> wrappers: every open section
+    # sees the same text, which is the worst case for per-section bookkeeping.
+    body = "".join(f"<span>word{i}</span> " for i in range(words))
+    return "<html><body>" + "<div><h2>T</h2>" * levels + "<p>" + body + "</p>" + "</div>" * levels + "</body></html>"
+
+
+def _time(html: str, runs: int):
+    timings = []
+    found = 0
+    for _ in range(max(1, runs)):
+        start = time.perf_counter()
+        found = _run(html)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), found
+
+
+def _run(html: str) -> int:
+    root = parse_html(html)
+    clean_tree(root)
+    return len(segment(root)['sections'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, nargs="+", default=[1000, 4000])
+    parser.add_argument("--nesting", type=int, nargs="*", default=[1, 100, 240])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    report = []
+    for n in args.sections:
+        html = _page(n)
+        median, found = _time(html, args.runs)
+        report.append({
+            "blocks": n,
+            "size_kb": len(html) // 1000,
+            "sections": found,
+            "median_ms": round(median * 1000, 1),
+            "ms_per_mb": round(median * 1000 / (len(html) / 1e6), 1),
+        })
+
+    for levels in args.nesting:
+        html = _nested_page(levels)
+        median, found = _time(html, args.runs)
+        report.append({
+            "nested": levels,
+            "size_kb": len(html) // 1000,
+            "sections": found,
+            "median_ms": round(median * 1000, 1),
+            "ms_per_mb": round(median * 1000 / (len(html) / 1e6), 1),
+        })
+
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,80 @@
+# Startup benchmark for the CLI, API and Streamlit entry points.
+# Quick-run:
+# python tests/bench_startup.py --runs 5
+#
+# Each entry point is imported in a fresh interpreter so the numbers reflect a cold start.
+# The report also lists which heavy dependencies were loaded by the import itself; these
+# should only appear once a crawl or extraction actually runs.
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = {
+    "cli": "module_extractor",
+    "api": "fastapi_app",
+    "streamlit": "streamlit_app",
+}
+
+HEAVY_MODULES = ["trafilatura", "bs4", "lxml", "tldextract", "requests_cache", "requests", "markdown"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy_loaded": heavy}}))
+"""
+
+
+def _measure(module: str):
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(ROOT),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return None, proc.stderr.strip().splitlines()[-1:] or ["import failed"]
+    # Streamlit prints bare-mode warnings; the probe result is always the last line.
+    return json.loads(proc.stdout.strip().splitlines()[-1]), None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--only", choices=sorted(ENTRY_POINTS), nargs="*")
+    args = parser.parse_args()
+
+    report = {}
+    for name, module in ENTRY_POINTS.items():
+        if args.only and name not in args.only:
+            continue
+        timings = []
+        heavy = []
+        error = None
+        for _ in range(max(1, args.runs)):
+            result, error = _measure(module)
+            if result is None:
+                break
+            timings.append(result["seconds"])
+            heavy = result["heavy_loaded"]
+        if error:
+            report[name] = {"module": module, "error": error[0]}
+            continue
+        report[name] = {
+            "module": module,
+            "median_ms": round(statistics.median(timings) * 1000, 1),
+            "min_ms": round(min(timings) * 1000, 1),
+            "runs": len(timings),
+            "heavy_loaded": heavy,
+        }
+
+    print(json.dumps(report, indent=2))
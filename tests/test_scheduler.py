@@ -0,0 +1,160 @@
+# Checks for the per-host scheduler, driven with a fake clock (no network, no real sleeping).
+# Quick-run:
+# python tests/test_scheduler.py   (or: python -m pytest -q tests/test_scheduler.py)
+
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.pulse_extractor import crawler
+from src.pulse_extractor.scheduler import HostScheduler, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _scheduler(delay: float = 1.0, **kwargs):
+    clock = FakeClock()
+    return HostScheduler(delay=delay, clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 0 ") == 0.0
+    assert parse_retry_after("-5") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412480.0) == 30.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412480.0 + 60) == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_token_bucket_spaces_requests_per_host():
+    s, clock = _scheduler(delay=1.0)
+    s.acquire("a")
+    assert s.ready_in("a") == 1.0
+    assert s.ready_in("b") == 0.0
+    s.acquire("a")
+    assert clock.slept == [1.0]
+
+
+def test_next_host_prefers_ready_then_least_recently_served():
+    s, clock = _scheduler(delay=1.0)
+    s.acquire("a")
+    clock.now += 0.1
+    s.acquire("b")
+    # Neither is ready: wait only until the earliest one ("a") is.
+    assert s.next_host(["a", "b", "c"]) == "c"
+    s.acquire("c")
+    assert s.next_host(["a", "b", "c"]) == "a"
+    assert clock.slept == [0.9]
+    assert s.next_host([]) is None
+
+
+def test_round_robin_without_clock_progress():
+    # With a frozen clock (or a coarse one) ties are still broken by serve order.
+    s, _ = _scheduler(delay=0.0)
+    order = []
+    for _ in range(6):
+        host = s.next_host(["a", "b", "c"])
+        s.acquire(host)
+        order.append(host)
+    assert order == ["a", "b", "c", "a", "b", "c"]
+
+
+def test_429_blocks_host_for_retry_after():
+    s, clock = _scheduler(delay=0.2)
+    s.acquire("a")
+    s.record("a", 429, 0.1, "120")
+    assert s.ready_in("a") == 120.0
+    assert s.next_host(["a", "b"]) == "b"
+    assert clock.slept == []
+    # Retry-After is capped, and 503 without one still backs off.
+    s.record("b", 503, 0.1, "100000")
+    assert s.ready_in("b") == s.max_retry_after
+    s.record("c", 503, 0.1)
+    assert s.ready_in("c") > 0
+
+
+def test_retry_after_ignored_on_success():
+    s, _ = _scheduler(delay=0.2)
+    s.record("a", 200, 0.1, "120")
+    s.record("a", 301, 0.1, "120")
+    assert s.ready_in("a") == 0.0
+    assert s.hosts["a"].interval <= 0.2
+
+
+def test_backoff_and_speed_up_limits():
+    s, _ = _scheduler(delay=1.0, max_delay=5.0)
+    for _ in range(20):
+        s.record("a", 500, 0.1)
+    assert s.hosts["a"].interval == 5.0
+    for _ in range(200):
+        s.record("b", 200, 0.05)
+    assert s.hosts["b"].interval == 0.25
+    # A latency spike slows a healthy host down again.
+    s.record("b", 200, 5.0)
+    assert s.hosts["b"].interval > 0.25
+
+
+def test_zero_delay_still_backs_off_on_errors():
+    s, _ = _scheduler(delay=0.0)
+    s.acquire("a")
+    assert s.ready_in("a") == 0.0
+    s.record("a", 500, 0.1)
+    assert s.hosts["a"].interval >= s.backoff_floor
+
+
+def test_cooling_host_does_not_block_others():
+    # One host answers 429 Retry-After: 120; the healthy host must be crawled without waiting.
+    clock = FakeClock()
+    order = []
+
+    def fake_fetch(url, scheduler=None, host=None, recorder=None, **kwargs):
+        order.append((clock.now, url))
+        if host == "slow.example.com":
+            scheduler.record(host, 429, 0.1, "120")
+            return crawler.RETRY_LATER
+        scheduler.record(host, 200, 0.1)
+        return "<html><body><p>ok</p></body></html>", "text/html"
+
+    saved = (crawler._fetch, crawler._robots_allowed, crawler.HostScheduler)
+    crawler._fetch = fake_fetch
+    crawler._robots_allowed = lambda url: True
+    crawler.HostScheduler = lambda delay: HostScheduler(delay=delay, clock=clock, sleep=clock.sleep)
+    try:
+        pages = crawler.crawl_urls(
+            ["https://slow.example.com/", "https://fast.example.com/", "https://other.example.org/"],
+            max_pages=0,
+            per_domain_limit=0,
+            delay=0.3,
+        )
+    finally:
+        crawler._fetch, crawler._robots_allowed, crawler.HostScheduler = saved
+
+    assert [p.url for p in pages] == ["https://fast.example.com/", "https://other.example.org/"]
+    healthy = [t for t, u in order if "slow" not in u]
+    assert healthy == [0.0, 0.0]
+    slow = [t for t, u in order if "slow" in u]
+    # First attempt plus two retries, each after the host's Retry-After.
+    assert slow == [0.0, 120.0, 240.0]
+
+
+if __name__ == "__main__":
+    tests = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for t in tests:
+        t()
+        print(f"ok  {t.__name__}")
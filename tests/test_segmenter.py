@@ -0,0 +1,83 @@
+# Regression checks for the single-pass segmenter (no network needed).
+# Quick-run:
+# python tests/test_segmenter.py   (or: python -m pytest -q tests/test_segmenter.py)
+
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.pulse_extractor.segmenter import parse_html, clean_tree, segment, MAX_SECTIONS
+
+
+def _segment(html: str):
+    root = parse_html(html)
+    clean_tree(root)
+    return segment(root)
+
+
+def _bodies(result):
+    return {s['title']: s['body'] for s in result['sections']}
+
+
+def test_sections_follow_siblings_until_next_heading():
+    html = """<html><body><main>
+    <h1>Manage Account</h1><p>Manage your account.</p> tail text
+    <h2>Delete Account</h2><p>How to delete.</p><ul><li>one</li><li>two</li></ul>
+    <div><h3>Nested</h3><p>nested body</p></div>
+    <h2>Deactivate</h2><script>var x = 1;</script><p>Deactivate temporarily.</p>
+    </main><div class="site-footer"><h2>Footer</h2><p>footer</p></div></body></html>"""
+    bodies = _bodies(_segment(html))
+    assert bodies == {
+        'Manage Account': 'Manage your account.\ntail text',
+        'Delete Account': 'How to delete.\none two\nNested nested body',
+        'Nested': 'nested body',
+        'Deactivate': 'Deactivate temporarily.',
+    }
+
+
+def test_inline_comments_keep_surrounding_text():
+    html = """<html><body><main><h2>Create <!-- -->items</h2>
+    <p>Use the <!-- x -->API to create items.</p><p>one <!--c-->two</p><?php echo 1; ?>three
+    </main></body></html>"""
+    result = _segment(html)
+    assert _bodies(result) == {'Create items': 'Use the API to create items.\none two\nthree'}
+    assert result['headings'] == [{'level': 2, 'title': 'Create items'}]
+
+
+def test_main_container_and_paragraph_fallback():
+    html = """<html><head><title>Only Paras</title></head><body>
+    <p>outside</p><article><p>p1</p><p>p2 <i>x</i></p></article></body></html>"""
+    result = _segment(html)
+    assert result['sections'] == []
+    assert result['paragraphs'] == ['p1', 'p2 x']
+    assert result['title'] == 'Only Paras'
+
+
+def test_noise_class_on_root_and_body_is_kept():
+    html = """<html class="has-navbar-fixed-top"><body class="page-header-fixed">
+    <nav class="navbar"><h2>Nav</h2></nav><h2>Intro</h2><p>Body text.</p></body></html>"""
+    assert _bodies(_segment(html)) == {'Intro': 'Body text.'}
+
+
+def test_unparseable_documents_return_none():
+    assert parse_html("") is None
+    assert parse_html("<?xml version='1.0' encoding='utf-8'?>\n") is None
+    assert parse_html("<?xml version='1.0' encoding='utf-8'?><html><body><p>x</p></body></html>") is not None
+
+
+def test_headings_and_sections_are_capped():
+    html = "<html><body>" + "<h2>T</h2><p>b</p>" * (MAX_SECTIONS + 10) + "</body></html>"
+    result = _segment(html)
+    assert len(result['headings']) == MAX_SECTIONS
+    assert len(result['sections']) == MAX_SECTIONS
+
+
+if __name__ == "__main__":
+    tests = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for t in tests:
+        t()
+        print(f"ok  {t.__name__}")
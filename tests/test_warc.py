@@ -0,0 +1,122 @@
+# WARC record/replay round-trip checks (no network: requests.get is replaced by a fake).
+# Quick-run:
+# python tests/test_warc.py   (or: python -m pytest -q tests/test_warc.py)
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Ensure project root is on sys.path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.pulse_extractor import crawler
+from src.pulse_extractor.warc import WarcArchive, WarcRecorder
+
+
+def _response(url: str, body: bytes, status: int = 200, headers=None, encoding=None):
+    resp = requests.models.Response()
+    resp.url = url
+    resp.status_code = status
+    resp.reason = "OK" if status == 200 else "Error"
+    resp.headers = CaseInsensitiveDict(headers or {})
+    resp._content = body
+    resp.encoding = encoding
+    return resp
+
+
+def _fetch_with(fake_get, recorder):
+    saved = requests.get
+    requests.get = fake_get
+    try:
+        return crawler._fetch("https://docs.example.com/page", recorder=recorder, retries=0)
+    finally:
+        requests.get = saved
+
+
+def test_replay_matches_live_text_without_content_type():
+    # No Content-Type: requests falls back to the detected charset, which must be reused on replay.
+    body = "<html><body><h2>Café crème — naïve</h2><p>Résumé des données.</p></body></html>".encode("cp1252")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "crawl.warc.gz")
+        live = _response("https://docs.example.com/page", body)
+        with WarcRecorder(path) as recorder:
+            fetched = _fetch_with(lambda url, **kw: live, recorder)
+        with WarcArchive(path) as archive:
+            replayed = crawler._replay("https://docs.example.com/page", archive)
+    assert fetched == (live.text, None)
+    assert replayed == fetched
+
+
+def test_replay_keeps_header_charset_and_latest_capture():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "crawl.warc.gz")
+        with WarcRecorder(path) as recorder:
+            for text in ("old", "nouvelle capture é"):
+                resp = _response(
+                    "https://docs.example.com/a",
+                    f"<p>{text}</p>".encode("latin-1"),
+                    headers={"Content-Type": "text/html; charset=ISO-8859-1", "Content-Encoding": "gzip"},
+                    encoding="ISO-8859-1",
+                )
+                recorder.write_response(resp.url, 200, "OK", resp.headers, resp.content, encoding=resp.encoding)
+        with WarcArchive(path) as archive:
+            assert len(archive) == 1
+            archived = archive.get("https://docs.example.com/a")
+            assert archive.get("https://docs.example.com/missing") is None
+    assert archived.text == "<p>nouvelle capture é</p>"
+    assert "Content-Encoding" not in archived.headers
+
+
+def _site(url: str):
+    # Three small help sites; each page links to two more pages on the same host.
+    host = url.split("/")[2]
+    path = "/" + url.split("/", 3)[3] if url.count("/") > 2 else "/"
+    if path.endswith("/4"):
+        return _response(url, b"", status=404)
+    links = "".join(f'<a href="/help/{n}">{n}</a>' for n in range(1, 5) if f"/help/{n}" != path)
+    html = f"<html><body><h2>{host}{path}</h2><p>Body of {path}.</p>{links}</body></html>"
+    return _response(url, html.encode("utf-8"), headers={"Content-Type": "text/html; charset=utf-8"}, encoding="utf-8")
+
+
+def test_multi_domain_replay_returns_same_pages_in_same_order():
+    urls = ["https://a.example.com/help/", "https://b.example.org/help/", "https://c.example.net/help/"]
+    saved = (requests.get, crawler._robots_allowed)
+    requests.get = lambda url, **kw: _site(url)
+    crawler._robots_allowed = lambda url: True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "crawl.warc.gz")
+            live = crawler.crawl_urls(urls, max_pages=0, per_domain_limit=0, delay=0, record_warc=path)
+            # No network on replay: any request would fail the test.
+            requests.get = None
+            replayed = crawler.crawl_urls(urls, max_pages=0, per_domain_limit=0, replay_warc=path)
+    finally:
+        requests.get, crawler._robots_allowed = saved
+
+    hosts = [p.url.split("/")[2][0] for p in live]
+    assert hosts[:6] == ["a", "b", "c", "a", "b", "c"]
+    assert len(live) == 12
+    assert [(p.url, p.html, p.content_type) for p in replayed] == [(p.url, p.html, p.content_type) for p in live]
+
+
+def test_recorder_failure_does_not_abort_fetch():
+    class BrokenRecorder:
+        path = "broken.warc.gz"
+
+        def write_response(self, *args, **kwargs):
+            raise OSError("No space left on device")
+
+    resp = _response("https://docs.example.com/page", b"<p>ok</p>", headers={"Content-Type": "text/html; charset=utf-8"})
+    assert _fetch_with(lambda url, **kw: resp, BrokenRecorder()) == ("<p>ok</p>", "text/html; charset=utf-8")
+
+
+if __name__ == "__main__":
+    tests = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for t in tests:
+        t()
+        print(f"ok  {t.__name__}")